@@ -1,11 +1,78 @@
 # src/eda.py
 
+from functools import partial
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+try:
+    from .partitioned_dataset import (PartitionedDataset, combine_counts, combine_daily_counts,
+                                      count_days, count_values, sort_counts)
+except ImportError:
+    from partitioned_dataset import (PartitionedDataset, combine_counts, combine_daily_counts,
+                                     count_days, count_values, sort_counts)
+
+DAY_NAMES = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday',
+             4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
+
+
+def _headline_length_counts(df):
+    """
+    Count how many headlines of each length a partition contains.
+    """
+    if 'headline_length' in df.columns:
+        return df['headline_length'].value_counts()
+    return df['headline'].apply(len).value_counts()
+
+
+def _day_of_week_counts(df):
+    """
+    Count the articles a partition contains for each day of the week.
+    """
+    return pd.to_datetime(df['date']).dt.dayofweek.map(DAY_NAMES).rename('day_of_week').value_counts()
+
+
+def _length_stats(length_counts):
+    """
+    Compute the textual length statistics from the number of headlines of each length.
+    """
+    length_counts = length_counts.sort_index()
+    lengths = length_counts.index.to_numpy()
+    counts = length_counts.to_numpy()
+    n = counts.sum()
+    if n == 0:
+        # No headlines, statistics of an empty column are all NaN
+        return {key: np.nan for key in ('mean_headline_length', 'median_headline_length', 'std_headline_length',
+                                        'max_headline_length', 'min_headline_length')}
+    mean = (lengths * counts).sum() / n
+
+    # The median is the middle length (or the mean of the two middle lengths) of the sorted headlines
+    cumulative = counts.cumsum()
+    lower = lengths[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+    upper = lengths[np.searchsorted(cumulative, n // 2, side='right')]
+
+    return {
+        'mean_headline_length': mean,
+        'median_headline_length': (lower + upper) / 2,
+        'std_headline_length': np.sqrt((counts * (lengths - mean) ** 2).sum() / (n - 1)),
+        'max_headline_length': lengths.max(),
+        'min_headline_length': lengths.min()
+    }
+
+
 class EDA:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df):
+        """
+        :param df: DataFrame with the data, or PartitionedDataset to analyze the data one partition at a time
+        """
+        if isinstance(df, PartitionedDataset):
+            self.df = None
+            self.dataset = df
+            return
+
         self.df = df
+        self.dataset = None
         # Ensure the headline_length column is present
         if 'headline_length' not in self.df.columns:
             self.df['headline_length'] = self.df['headline'].apply(len)
@@ -14,6 +81,11 @@ class EDA:
         """
         Obtain basic statistics for textual lengths, such as headline length.
         """
+        if self.dataset is not None:
+            columns = ['headline_length'] if 'headline_length' in self.dataset.columns else ['headline']
+            return self.dataset.map_reduce(_headline_length_counts, lambda partials: _length_stats(combine_counts(partials)),
+                                           columns=columns)
+
         stats = {
             'mean_headline_length': self.df['headline_length'].mean(),
             'median_headline_length': self.df['headline_length'].median(),
@@ -27,18 +99,23 @@ class EDA:
         """
         Count the number of articles per publisher to identify the most active publishers.
         """
-        publisher_counts = self.df['publisher'].value_counts()
+        if self.dataset is not None:
+            return sort_counts(self.dataset.map_reduce(partial(count_values, column='publisher'), combine_counts,
+                                                       columns=['publisher']))
+
+        publisher_counts = sort_counts(self.df['publisher'].value_counts())
         return publisher_counts
     
     def analyze_publication_dates(self):
         """
         Analyze publication dates to see trends over time.
         """
-        # Set the publication date as index
-        self.df.set_index('date', inplace=True)
-        
-        # Resample by day and count the number of articles
-        daily_counts = self.df.resample('D').size()
+        if self.dataset is not None:
+            daily_counts = self.dataset.map_reduce(count_days, combine_daily_counts, columns=['date'])
+        else:
+            # Resample by day and count the number of articles
+            daily_counts = count_days(self.df)
+
         daily_counts.plot(figsize=(12, 6))
         plt.title('Number of Articles Published Per Day')
         plt.xlabel('Date')
@@ -46,20 +123,18 @@ class EDA:
         plt.grid(True)
         plt.show()
 
+        return daily_counts
+
     def plot_day_of_week_frequency(self):
         """
         Plot the frequency of articles published on each day of the week.
         """
-        # Extract the day of the week (Monday=0, Sunday=6)
-        self.df['day_of_week'] = self.df.index.dayofweek
-        
-        # Map the numbers to actual day names
-        day_names = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 
-                     4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
-        self.df['day_of_week'] = self.df['day_of_week'].map(day_names)
-        
-        # Count the number of articles published on each day of the week
-        day_counts = self.df['day_of_week'].value_counts().reindex(day_names.values())
+        if self.dataset is not None:
+            day_counts = self.dataset.map_reduce(_day_of_week_counts, combine_counts, columns=['date'])
+        else:
+            # Count the number of articles published on each day of the week
+            day_counts = _day_of_week_counts(self.df)
+        day_counts = day_counts.reindex(DAY_NAMES.values())
         
         # Plot the results
         day_counts.plot(kind='bar', figsize=(10, 6), color='skyblue')
@@ -70,6 +145,8 @@ class EDA:
         plt.grid(True)
         plt.show()
 
+        return day_counts
+
 
     def identify_spikes(self, threshold=2.0):
         """
@@ -78,13 +155,11 @@ class EDA:
         :param threshold: float, multiplier of standard deviation above the mean to consider a spike
         :return: DataFrame of spike dates and their counts
         """
-        # Ensure the 'date' column is set as the index and is a DatetimeIndex
-        if not isinstance(self.df.index, pd.DatetimeIndex):
-            self.df['date'] = pd.to_datetime(self.df['date'], utc=True)
-            self.df.set_index('date', inplace=True)
-
-        # Resample by day and count the number of articles
-        daily_counts = self.df.resample('D').size()
+        # Resample by day (in UTC) and count the number of articles
+        if self.dataset is not None:
+            daily_counts = self.dataset.map_reduce(partial(count_days, utc=True), combine_daily_counts, columns=['date'])
+        else:
+            daily_counts = count_days(self.df, utc=True)
         
         # Calculate mean and standard deviation of daily article counts
         mean_count = daily_counts.mean()
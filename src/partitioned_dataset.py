@@ -0,0 +1,132 @@
+# src/partitioned_dataset.py
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+
+def _apply_to_partition(fragment, schema, columns, func):
+    """
+    Load a single partition into pandas and apply func to it.
+    Defined at module level so it can be shipped to worker processes.
+    """
+    df = fragment.to_table(columns=columns, schema=schema).to_pandas()
+    return func(df)
+
+
+class PartitionedDataset:
+    def __init__(self, source, format='parquet', max_workers=None, use_processes=False):
+        """
+        Wrap a partitioned on-disk dataset so the analysis classes can process it
+        one partition at a time instead of loading it into memory.
+
+        :param source: path or list of paths to the data files/directories, or an existing pyarrow Dataset
+        :param format: file format of the dataset, passed to pyarrow.dataset (default is 'parquet')
+        :param max_workers: int, number of partitions processed in parallel (default is chosen by the executor)
+        :param use_processes: bool, use worker processes instead of threads for CPU-bound, pure-Python work such as sentiment scoring
+        """
+        if isinstance(source, ds.Dataset):
+            self.dataset = source
+        else:
+            self.dataset = ds.dataset(source, format=format)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+    @property
+    def columns(self):
+        return self.dataset.schema.names
+
+    def partitions(self):
+        """
+        List the partitions of the dataset. Parquet files are split into their
+        row groups, any other fragment is used as a whole.
+        """
+        partitions = []
+        for fragment in self.dataset.get_fragments():
+            if isinstance(fragment, ds.ParquetFileFragment):
+                partitions.extend(fragment.split_by_row_group())
+            else:
+                partitions.append(fragment)
+        return partitions
+
+    def map_partitions(self, func, columns=None):
+        """
+        Apply a function to every partition in parallel.
+
+        :param func: callable taking a DataFrame and returning a partial result; must be picklable when use_processes is set
+        :param columns: list of columns to read from each partition (default is all columns)
+        :return: list of partial results, in partition order
+        """
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=self.max_workers) as executor:
+            return list(executor.map(_apply_to_partition, self.partitions(),
+                                     repeat(self.dataset.schema), repeat(columns), repeat(func)))
+
+    def map_reduce(self, func, combine, columns=None):
+        """
+        Apply a function to every partition and combine the partial results.
+
+        :param func: callable taking a DataFrame and returning a partial result
+        :param combine: callable taking the list of partial results and returning the final result
+        :param columns: list of columns to read from each partition (default is all columns)
+        """
+        return combine(self.map_partitions(func, columns=columns))
+
+    def to_pandas(self, columns=None):
+        """
+        Load the given columns of the whole dataset into a single DataFrame.
+        Only meant for analyses that cannot be split into partial aggregates.
+        """
+        return self.dataset.to_table(columns=columns).to_pandas()
+
+
+def count_values(df, column):
+    """
+    Count the occurrences of each value of a column in a partition.
+    """
+    return df[column].value_counts()
+
+
+def count_days(df, utc=False):
+    """
+    Count the number of articles per day in a partition.
+
+    :param utc: bool, bin days in UTC instead of the timezone stored with the dates
+    """
+    dates = pd.to_datetime(df['date'], utc=utc)
+    return df.set_index(dates).resample('D').size()
+
+
+def combine_counts(partials):
+    """
+    Sum partial counts (Series sharing the same kind of index) into a single Series sorted by index.
+    """
+    if not partials:
+        return pd.Series(dtype='int64')
+    counts = pd.concat(partials)
+    if counts.index.nlevels > 1:
+        return counts.groupby(level=list(range(counts.index.nlevels))).sum()
+    return counts.groupby(level=0).sum()
+
+
+def combine_daily_counts(partials):
+    """
+    Sum partial daily counts and fill the days without articles with zero,
+    as a resample over the whole dataset does.
+    """
+    partials = [partial for partial in partials if not partial.empty]
+    if not partials:
+        # Empty dataset, resampling it yields no days
+        return pd.Series(dtype='int64', index=pd.DatetimeIndex([], name='date', freq='D'))
+    counts = combine_counts(partials)
+    days = pd.date_range(counts.index.min(), counts.index.max(), freq='D', name=counts.index.name)
+    return counts.reindex(days, fill_value=0)
+
+
+def sort_counts(counts):
+    """
+    Sort counts in descending order, breaking ties by index so the order is the same
+    for in-memory and partitioned data, whatever order the values first appear in.
+    """
+    return counts.sort_index().sort_values(ascending=False, kind='mergesort')
@@ -1,4 +1,6 @@
 # src/publisher_analysis.py
+from functools import partial
+
 import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
@@ -12,19 +14,74 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import LabelEncoder
 
+try:
+    from .partitioned_dataset import PartitionedDataset, combine_counts, count_values, sort_counts
+except ImportError:
+    from partitioned_dataset import PartitionedDataset, combine_counts, count_values, sort_counts
+
+
+def _email_domain(publisher):
+    return publisher.split('@')[1] if '@' in publisher else None
+
+
+def _url_domain(publisher):
+    return urlparse(publisher).netloc if '.' in publisher else None
+
+
+def _domain_counts(df):
+    """
+    Count the publisher domains of a partition under both extraction rules, since
+    which one applies depends on whether any publisher in the whole data is an email address.
+    """
+    return (df['publisher'].str.contains('@').any(),
+            df['publisher'].apply(_email_domain).rename('domain').value_counts(),
+            df['publisher'].apply(_url_domain).rename('domain').value_counts())
+
+
+def _combine_domain_counts(partials):
+    if any(has_emails for has_emails, _, _ in partials):
+        return sort_counts(combine_counts([email_counts for _, email_counts, _ in partials]))
+    return sort_counts(combine_counts([url_counts for _, _, url_counts in partials]))
+
+
+def _categorize(headline, model, label_encoder):
+    prediction = model.predict([headline])[0]
+    return label_encoder.inverse_transform([prediction])[0]  # Convert label back to original category
+
+
+def _news_type_counts(df, model, label_encoder):
+    """
+    Categorize the headlines of a partition and count the articles per publisher and news type.
+    """
+    news_type = df['headline'].apply(_categorize, args=(model, label_encoder)).rename('news_type')
+    return df.groupby(['publisher', news_type]).size()
+
+
 class PublisherAnalysis:
-    def __init__(self, df: pd.DataFrame):
-        
-        self.df = df
+    def __init__(self, df):
+        """
+        :param df: DataFrame with the data, or PartitionedDataset to analyze the data one partition at a time
+        """
+        if isinstance(df, PartitionedDataset):
+            self.df = None
+            self.dataset = df
+        else:
+            self.df = df
+            self.dataset = None
         self.model = None
         self.vectorizer = None
         self.label_encoder = None
+        self.news_type_counts = None
 
     def most_active_publishers(self):
         """
         Identifies which publishers contribute most to the news feed.
         """
-        publisher_counts = self.df['publisher'].value_counts()
+        if self.dataset is not None:
+            publisher_counts = sort_counts(self.dataset.map_reduce(partial(count_values, column='publisher'),
+                                                                   combine_counts, columns=['publisher']))
+        else:
+            publisher_counts = sort_counts(self.df['publisher'].value_counts())
 
         # Plot the top publishers
         plt.figure(figsize=(12, 6))
@@ -42,22 +99,23 @@ class PublisherAnalysis:
         If email addresses are used as publisher names, identify unique domains to see if certain organizations contribute more frequently.
         """
         # Ensure 'publisher' column exists
-        if 'publisher' not in self.df.columns:
+        columns = self.dataset.columns if self.dataset is not None else self.df.columns
+        if 'publisher' not in columns:
             raise ValueError("DataFrame must contain a 'publisher' column.")
 
-        # Extract domains from email addresses or URLs
-        if self.df['publisher'].str.contains('@').any():
-            # Extract domains from email addresses
-            self.df['domain'] = self.df['publisher'].apply(lambda x: x.split('@')[1] if '@' in x else None)
+        if self.dataset is not None:
+            domain_counts = self.dataset.map_reduce(_domain_counts, _combine_domain_counts, columns=['publisher'])
         else:
-            # Extract domains from URLs if they exist in the 'publisher' field
-            self.df['domain'] = self.df['publisher'].apply(lambda x: urlparse(x).netloc if '.' in x else None)
-
-        # Drop rows where domain extraction failed
-        self.df.dropna(subset=['domain'], inplace=True)
+            # Extract domains from email addresses or URLs
+            if self.df['publisher'].str.contains('@').any():
+                # Extract domains from email addresses
+                domains = self.df['publisher'].apply(_email_domain)
+            else:
+                # Extract domains from URLs if they exist in the 'publisher' field
+                domains = self.df['publisher'].apply(_url_domain)
 
-        # Count occurrences of each domain
-        domain_counts = self.df['domain'].value_counts()
+            # Count occurrences of each domain, skipping publishers where domain extraction failed
+            domain_counts = sort_counts(domains.rename('domain').value_counts())
 
         # Plot the top domains
         plt.figure(figsize=(12, 6))
@@ -77,7 +135,7 @@ class PublisherAnalysis:
         This step requires a dataset with predefined categories.
         """
         # Ensure 'news_type' column exists with default value 'Other'
-        if 'news_type' not in self.df.columns:
+        if self.df is not None and 'news_type' not in self.df.columns:
             self.df['news_type'] = 'Other'
         
         # Example: Load a sample dataset with predefined categories (replace with actual data source)
@@ -97,7 +155,8 @@ class PublisherAnalysis:
         self.label_encoder.fit(categories)  # Fit on all possible categories
 
         sample_data['news_type'] = self.label_encoder.transform(sample_data['news_type'])
-        self.df['news_type'] = self.label_encoder.transform(self.df['news_type'])
+        if self.df is not None:
+            self.df['news_type'] = self.label_encoder.transform(self.df['news_type'])
 
         X = sample_data['headline']
         y = sample_data['news_type']
@@ -129,8 +188,7 @@ class PublisherAnalysis:
         Categorize a single headline using the trained model.
         """
         if self.model:
-            prediction = self.model.predict([headline])[0]
-            return self.label_encoder.inverse_transform([prediction])[0]  # Convert label back to original category
+            return _categorize(headline, self.model, self.label_encoder)
         else:
             return 'Other'
 
@@ -145,10 +203,16 @@ class PublisherAnalysis:
 
         # Apply model to categorize headlines
         if self.model:
-            self.df['news_type'] = self.df['headline'].apply(self.categorize_headline)
+            if self.dataset is not None:
+                news_type_counts = self.dataset.map_reduce(
+                    partial(_news_type_counts, model=self.model, label_encoder=self.label_encoder),
+                    combine_counts, columns=['headline', 'publisher']).unstack().fillna(0)
+            else:
+                self.df['news_type'] = self.df['headline'].apply(self.categorize_headline)
 
-            # Count the number of articles for each news type per publisher
-            news_type_counts = self.df.groupby(['publisher', 'news_type']).size().unstack().fillna(0)
+                # Count the number of articles for each news type per publisher
+                news_type_counts = self.df.groupby(['publisher', 'news_type']).size().unstack().fillna(0)
+            self.news_type_counts = news_type_counts
 
             # Plot a heatmap to visualize the distribution of news types per publisher
             plt.figure(figsize=(12, 8))
@@ -174,20 +238,32 @@ class PublisherAnalysis:
             dict: A dictionary with publisher names as keys and their news type distribution as values.
         """
         # Ensure the model is trained and news types are categorized
-        if 'news_type' not in self.df.columns:
-            print("Categorizing news types...")
-            self.analyze_news_type()
+        if self.dataset is not None:
+            if self.news_type_counts is None:
+                print("Categorizing news types...")
+                self.analyze_news_type()
+
+            # Get the top N publishers from their total number of categorized articles
+            top_publishers = sort_counts(self.news_type_counts.sum(axis=1)).head(top_n).index
+        else:
+            if 'news_type' not in self.df.columns:
+                print("Categorizing news types...")
+                self.analyze_news_type()
 
-        # Get the top N publishers
-        top_publishers = self.df['publisher'].value_counts().head(top_n).index
+            # Get the top N publishers
+            top_publishers = sort_counts(self.df['publisher'].value_counts()).head(top_n).index
 
         # Initialize the result dictionary
         result = {}
 
         # Analyze news types for each top publisher
         for publisher in top_publishers:
-            publisher_data = self.df[self.df['publisher'] == publisher]
-            news_type_counts = publisher_data['news_type'].value_counts()
+            if self.dataset is not None:
+                news_type_counts = self.news_type_counts.loc[publisher]
+                news_type_counts = news_type_counts[news_type_counts > 0]
+            else:
+                publisher_data = self.df[self.df['publisher'] == publisher]
+                news_type_counts = publisher_data['news_type'].value_counts()
             total_articles = news_type_counts.sum()
 
             # Calculate the share of each news type
@@ -1,20 +1,121 @@
 # src/text_analysis.py
+from functools import partial
+
+import numpy as np
 import pandas as pd
 
 from sklearn.decomposition import LatentDirichletAllocation
 from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from nltk.corpus import stopwords
 import matplotlib.pyplot as plt
+
+try:
+    from .partitioned_dataset import PartitionedDataset, combine_counts, sort_counts
+except ImportError:
+    from partitioned_dataset import PartitionedDataset, combine_counts, sort_counts
+
+
+def _classify_sentiment(compound):
+    """
+    Classify sentiment based on the VADER compound score.
+    """
+    if compound >= 0.5:
+        return 'positive'
+    elif 0.05 <= compound < 0.5:
+        return 'neutral'
+    elif -0.5 < compound < 0.05:
+        return 'negative'
+    else:
+        return 'strong negative'
+
+
+def _score_sentiment(df):
+    """
+    Add the VADER sentiment columns to a DataFrame with a 'headline' column.
+    """
+    # Initialize VADER sentiment intensity analyzer
+    analyzer = SentimentIntensityAnalyzer()
+
+    # Apply VADER sentiment analysis to each headline
+    df['sentiment'] = df['headline'].apply(lambda x: analyzer.polarity_scores(x))
+
+    # Extract compound score for simplicity
+    df['compound'] = df['sentiment'].apply(lambda x: x['compound'])
+
+    # Classify sentiment based on compound score
+    df['sentiment_class'] = df['compound'].apply(_classify_sentiment)
+
+    # Separate polarity (compound score) and subjectivity (not provided by VADER, so kept simple)
+    df['polarity'] = df['compound']
+    df['subjectivity'] = df['headline'].apply(lambda x: analyzer.polarity_scores(x)['neu'])  # Approximation using neutrality
+
+    return df
+
+
+def _sentiment_sums(df):
+    """
+    Score the headlines of a partition and sum polarity and subjectivity per sentiment class.
+    """
+    df = _score_sentiment(df)
+    return df.groupby('sentiment_class').agg(count=('polarity', 'size'), polarity=('polarity', 'sum'),
+                                             subjectivity=('subjectivity', 'sum'))
+
+
+def _combine_sentiment_sums(partials):
+    if not partials:
+        # Dataset without partitions
+        return pd.DataFrame(columns=['count', 'polarity', 'subjectivity'])
+    return combine_counts(partials)
+
+
+def _ngram_counts(df, ngram_range, stop_words):
+    """
+    Count the total occurrences and the number of headlines containing each n-gram in a partition.
+    """
+    vectorizer = CountVectorizer(ngram_range=ngram_range, stop_words=stop_words, dtype=np.float64)
+
+    # CountVectorizer refuses to fit when no headline of the partition yields an n-gram,
+    # e.g. when they consist of stop words only
+    analyze = vectorizer.build_analyzer()
+    if not any(analyze(headline) for headline in df['headline']):
+        return pd.DataFrame(columns=['count', 'documents'], dtype=np.float64), len(df)
+
+    X = vectorizer.fit_transform(df['headline'])
+
+    counts = pd.DataFrame({
+        'count': np.asarray(X.sum(axis=0)).ravel(),
+        'documents': np.bincount(X.indices, minlength=X.shape[1]).astype(np.float64)
+    }, index=vectorizer.get_feature_names_out())
+    return counts, len(df)
+
+
+def _tfidf_sums(df, ngram_range, stop_words, vocabulary, idf):
+    """
+    Sum the TF-IDF weights of each keyword over the headlines of a partition.
+    """
+    vectorizer = CountVectorizer(ngram_range=ngram_range, stop_words=stop_words, vocabulary=vocabulary, dtype=np.float64)
+    X = vectorizer.transform(df['headline'])
+    X.data *= idf[X.indices]
+    X = normalize(X, norm='l2', copy=False)
+    return pd.Series(np.asarray(X.sum(axis=0)).ravel(), index=vocabulary)
+
+
 class TextAnalysis:
     def __init__(self, df):
         """
         Initialize the TextAnalysis object with the DataFrame containing the data.
         
-        :param df: DataFrame with the data to be analyzed
+        :param df: DataFrame with the data to be analyzed, or PartitionedDataset to analyze it one partition at a time
         """
-        self.df = df
+        if isinstance(df, PartitionedDataset):
+            self.df = None
+            self.dataset = df
+        else:
+            self.df = df
+            self.dataset = None
 
     
 
@@ -23,43 +124,48 @@ class TextAnalysis:
         Perform sentiment analysis on the headlines using VADER's SentimentIntensityAnalyzer.
         
         :return: DataFrame with added 'sentiment' column, where each sentiment is classified as positive, neutral, negative, or strong negative.
+
+        Not supported on a PartitionedDataset, since it returns one row per headline;
+        use summarize_sentiment instead.
         """
-        # Initialize VADER sentiment intensity analyzer
-        analyzer = SentimentIntensityAnalyzer()
-        
-        # Function to classify sentiment based on compound score
-        def classify_sentiment(compound):
-            if compound >= 0.5:
-                return 'positive'
-            elif 0.05 <= compound < 0.5:
-                return 'neutral'
-            elif -0.5 < compound < 0.05:
-                return 'negative'
-            else:
-                return 'strong negative'
-        
-        # Apply VADER sentiment analysis to each headline
-        self.df['sentiment'] = self.df['headline'].apply(lambda x: analyzer.polarity_scores(x))
-        
-        # Extract compound score for simplicity
-        self.df['compound'] = self.df['sentiment'].apply(lambda x: x['compound'])
-        
-        # Classify sentiment based on compound score
-        self.df['sentiment_class'] = self.df['compound'].apply(classify_sentiment)
-        
-        # Separate polarity (compound score) and subjectivity (not provided by VADER, so kept simple)
-        self.df['polarity'] = self.df['compound']
-        self.df['subjectivity'] = self.df['headline'].apply(lambda x: analyzer.polarity_scores(x)['neu'])  # Approximation using neutrality
+        if self.dataset is not None:
+            raise NotImplementedError("perform_sentiment_analysis returns one row per headline and is not supported "
+                                      "on a PartitionedDataset, use summarize_sentiment instead")
+
+        self.df = _score_sentiment(self.df)
+        sentiment_counts = sort_counts(self.df['sentiment_class'].value_counts())
+        self._plot_sentiment_distribution(sentiment_counts)
+
+        return self.df[['headline', 'polarity', 'subjectivity', 'sentiment_class']]
+
+    def summarize_sentiment(self):
+        """
+        Summarize the sentiment of the headlines per sentiment class, without keeping the per-headline scores.
+
+        :return: DataFrame indexed by sentiment class, with the number of headlines ('count') and their mean 'polarity' and 'subjectivity'
+        """
+        if self.dataset is not None:
+            sums = self.dataset.map_reduce(_sentiment_sums, _combine_sentiment_sums, columns=['headline'])
+        else:
+            sums = _sentiment_sums(self.df[['headline']].copy())
+
+        summary = pd.DataFrame({
+            'count': sums['count'],
+            'polarity': sums['polarity'] / sums['count'],
+            'subjectivity': sums['subjectivity'] / sums['count']
+        })
+        if not summary.empty:
+            self._plot_sentiment_distribution(sort_counts(summary['count']))
+
+        return summary
 
+    def _plot_sentiment_distribution(self, sentiment_counts):
         # Plot pie chart
-        sentiment_counts = self.df['sentiment_class'].value_counts()
         plt.figure(figsize=(8, 6))
         plt.pie(sentiment_counts, labels=sentiment_counts.index, autopct='%1.1f%%', startangle=140)
         plt.title('Sentiment Distribution')
         plt.show()
 
-        return self.df[['headline', 'polarity', 'subjectivity', 'sentiment_class']]
-
 
     def extract_keywords(self, ngram_range=(2, 3), max_features=100):
         """
@@ -71,6 +177,9 @@ class TextAnalysis:
         """
         # Extend the default stop words list
         custom_stop_words = stopwords.words('english') 
+
+        if self.dataset is not None:
+            return self._extract_partitioned_keywords(ngram_range, max_features, custom_stop_words)
         
         # Initialize TfidfVectorizer with given parameters
         vectorizer = TfidfVectorizer(ngram_range=ngram_range, max_features=max_features, stop_words=custom_stop_words)
@@ -86,6 +195,32 @@ class TextAnalysis:
         
         return phrase_counts
 
+    def _extract_partitioned_keywords(self, ngram_range, max_features, stop_words):
+        """
+        Compute the keyword weights of extract_keywords over a PartitionedDataset in two passes:
+        the first counts the n-grams to select the vocabulary and its IDF, the second sums the
+        TF-IDF weights of each partition, mirroring what TfidfVectorizer does over the whole data.
+        """
+        partials = self.dataset.map_partitions(partial(_ngram_counts, ngram_range=ngram_range, stop_words=stop_words),
+                                               columns=['headline'])
+        ngram_counts = combine_counts([counts for counts, _ in partials])
+        n_documents = sum(n for _, n in partials)
+
+        # Keep the most frequent n-grams, breaking ties the same way TfidfVectorizer does
+        if max_features is not None and len(ngram_counts) > max_features:
+            keep = (-ngram_counts['count'].to_numpy()).argsort()[:max_features]
+            ngram_counts = ngram_counts.iloc[np.sort(keep)]
+
+        # Smoothed inverse document frequency, as computed by TfidfTransformer
+        idf = np.log((n_documents + 1) / (ngram_counts['documents'].to_numpy() + 1.0)) + 1.0
+
+        tfidf_sums = self.dataset.map_reduce(
+            partial(_tfidf_sums, ngram_range=ngram_range, stop_words=stop_words,
+                    vocabulary=list(ngram_counts.index), idf=idf),
+            combine_counts, columns=['headline'])
+
+        return tfidf_sums.sort_values(ascending=False)
+
     def topic_modeling(self, n_topics=5, n_top_words=10):
         """
         Perform topic modeling using Latent Dirichlet Allocation (LDA).
@@ -93,14 +228,19 @@ class TextAnalysis:
         Parameters:
         - n_topics: Number of topics to extract
         - n_top_words: Number of top words to display for each topic
+
+        LDA cannot be split into partial aggregates, so with a PartitionedDataset
+        only the 'headline' column is loaded into memory.
         """
+        df = self.dataset.to_pandas(columns=['headline']) if self.dataset is not None else self.df
+
         # Ensure that 'headline' column exists and is not empty
-        if 'headline' not in self.df.columns or self.df['headline'].empty:
+        if 'headline' not in df.columns or df['headline'].empty:
             raise ValueError("DataFrame must contain a non-empty 'headline' column")
 
         # Preprocessing and vectorization
         tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_df=0.95, min_df=2)
-        tfidf = tfidf_vectorizer.fit_transform(self.df['headline'])
+        tfidf = tfidf_vectorizer.fit_transform(df['headline'])
 
         # Fit LDA model
         lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, n_jobs=-1)
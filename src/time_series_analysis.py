@@ -1,9 +1,33 @@
 # src/time_series_analysis.py
+from functools import partial
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+try:
+    from .partitioned_dataset import PartitionedDataset, combine_counts, combine_daily_counts, count_days
+except ImportError:
+    from partitioned_dataset import PartitionedDataset, combine_counts, combine_daily_counts, count_days
+
+
+def _hourly_counts(df):
+    """
+    Count the articles a partition contains for each hour of the day.
+    """
+    return df.groupby(pd.to_datetime(df['date']).dt.hour.rename('hour')).size()
+
+
 class TimeSeriesAnalysis:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df):
+        """
+        :param df: DataFrame with the data, or PartitionedDataset to analyze the data one partition at a time
+        """
+        if isinstance(df, PartitionedDataset):
+            self.df = None
+            self.dataset = df
+            return
+
+        self.dataset = None
         self.df = df.copy()
         self.df['date'] = pd.to_datetime(self.df['date'])
 
@@ -12,7 +36,10 @@ class TimeSeriesAnalysis:
         Analyzes publication frequency over time and identifies spikes in article publications.
         """
         # Resample by day and count the number of articles
-        daily_counts = self.df.resample('D', on='date').size()
+        if self.dataset is not None:
+            daily_counts = self.dataset.map_reduce(count_days, combine_daily_counts, columns=['date'])
+        else:
+            daily_counts = self.df.resample('D', on='date').size()
 
         # Plot the daily counts
         plt.figure(figsize=(12, 6))
@@ -23,15 +50,20 @@ class TimeSeriesAnalysis:
         plt.grid(True)
         plt.show()
 
+        return daily_counts
+
     def analyze_publishing_times(self):
         """
         Analyzes the time of day when articles are most frequently published.
         """
-        # Extract the hour from the publication date
-        self.df['hour'] = self.df['date'].dt.hour
+        if self.dataset is not None:
+            hourly_counts = self.dataset.map_reduce(_hourly_counts, combine_counts, columns=['date'])
+        else:
+            # Extract the hour from the publication date
+            self.df['hour'] = self.df['date'].dt.hour
 
-        # Group by hour and count the number of articles
-        hourly_counts = self.df.groupby('hour').size()
+            # Group by hour and count the number of articles
+            hourly_counts = self.df.groupby('hour').size()
 
         # Plot the hourly counts
         plt.figure(figsize=(12, 6))
@@ -42,6 +74,8 @@ class TimeSeriesAnalysis:
         plt.grid(True)
         plt.show()
 
+        return hourly_counts
+
     def identify_spikes(self, threshold=2.0):
         """
         Identify spikes in article publications where the number of articles is significantly higher than average.
@@ -49,13 +83,11 @@ class TimeSeriesAnalysis:
         :param threshold: float, multiplier of standard deviation above the mean to consider a spike
         :return: DataFrame of spike dates and their counts
         """
-        # Ensure the 'date' column is set as the index and is a DatetimeIndex
-        if not isinstance(self.df.index, pd.DatetimeIndex):
-            self.df['date'] = pd.to_datetime(self.df['date'], utc=True)
-            self.df.set_index('date', inplace=True)
-
-        # Resample by day and count the number of articles
-        daily_counts = self.df.resample('D').size()
+        if self.dataset is not None:
+            daily_counts = self.dataset.map_reduce(partial(count_days, utc=True), combine_daily_counts, columns=['date'])
+        else:
+            # Resample by day (in UTC) and count the number of articles
+            daily_counts = count_days(self.df, utc=True)
         
         # Calculate mean and standard deviation of daily article counts
         mean_count = daily_counts.mean()
@@ -0,0 +1,208 @@
+# tests/test_partitioned_dataset.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.eda import EDA
+from src.partitioned_dataset import PartitionedDataset
+from src.publisher_analysis import PublisherAnalysis
+from src.text_analysis import TextAnalysis
+from src.time_series_analysis import TimeSeriesAnalysis
+
+
+class TestPartitionedDataset(unittest.TestCase):
+    def setUp(self):
+        dates = ['2020-06-01 09:30', '2020-06-01 14:00', '2020-06-01 22:45', '2020-06-02 08:15',
+                 '2020-06-04 10:00', '2020-06-04 11:30', '2020-06-04 12:00', '2020-06-04 13:45',
+                 '2020-06-04 23:10', '2020-06-05 07:00', '2020-06-08 16:20', '2020-06-09 21:50']
+        self.df = pd.DataFrame({
+            'headline': ['Stocks That Hit 52-Week Highs On Monday', 'Price target raised',
+                         'FDA approval expected', 'Earnings beat estimates', 'Shares fall after guidance cut',
+                         'Analyst upgrades stock', 'Market rally continues', 'Company announces buyback',
+                         'Stocks that hit 52-week lows', 'Price target lowered', 'Dividend increased',
+                         'Merger talks confirmed'],
+            'publisher': ['Lisa Levin', 'Benzinga Newsdesk', 'Lisa Levin', 'vick@benzinga.com',
+                          'Lisa Levin', 'Benzinga Newsdesk', 'Lisa Levin', 'Charles Gross',
+                          'vick@benzinga.com', 'Benzinga Newsdesk', 'Lisa Levin', 'Charles Gross'],
+            'date': pd.to_datetime(dates).tz_localize('UTC').tz_convert('Africa/Nairobi')
+        })
+
+        # Write the data as two Parquet files with several row groups each
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        pq.write_table(table.slice(0, 7), os.path.join(self.tmp_dir.name, 'part-0.parquet'), row_group_size=3)
+        pq.write_table(table.slice(7), os.path.join(self.tmp_dir.name, 'part-1.parquet'), row_group_size=2)
+        self.dataset = PartitionedDataset(self.tmp_dir.name, max_workers=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_partitions(self):
+        self.assertEqual(len(self.dataset.partitions()), 6)
+
+    def test_textual_lengths_stats(self):
+        expected = EDA(self.df.copy()).get_textual_lengths_stats()
+        stats = EDA(self.dataset).get_textual_lengths_stats()
+        self.assertEqual(stats.keys(), expected.keys())
+        for key in expected:
+            self.assertAlmostEqual(stats[key], expected[key])
+
+    def test_count_articles_per_publisher(self):
+        expected = EDA(self.df.copy()).count_articles_per_publisher()
+        counts = EDA(self.dataset).count_articles_per_publisher()
+        pd.testing.assert_series_equal(counts, expected)
+
+    def test_count_ties(self):
+        df = pd.DataFrame({'headline': ['a', 'b', 'c', 'd', 'e', 'f'],
+                           'publisher': ['Zed', 'Zed', 'Amy', 'Amy', 'Bob', 'Bob']})
+        path = os.path.join(self.tmp_dir.name, 'ties.parquet')
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=2)
+        dataset = PartitionedDataset(path)
+
+        expected = PublisherAnalysis(df.copy()).most_active_publishers()
+        self.assertEqual(list(expected.index), ['Amy', 'Bob', 'Zed'])
+        pd.testing.assert_series_equal(PublisherAnalysis(dataset).most_active_publishers(), expected)
+
+    def test_identify_spikes(self):
+        expected = TimeSeriesAnalysis(self.df).identify_spikes(threshold=1.0)
+        spikes = TimeSeriesAnalysis(self.dataset).identify_spikes(threshold=1.0)
+        self.assertFalse(spikes.empty)
+        pd.testing.assert_series_equal(spikes, expected)
+
+        expected = EDA(self.df.copy()).identify_spikes(threshold=1.0)
+        pd.testing.assert_series_equal(EDA(self.dataset).identify_spikes(threshold=1.0), expected)
+
+    def test_eda_call_order(self):
+        # Results do not depend on which methods were called before
+        results = []
+        for eda in (EDA(self.df.copy()), EDA(self.dataset)):
+            spikes = eda.identify_spikes(threshold=1.0)
+            day_counts = eda.plot_day_of_week_frequency()
+            daily_counts = eda.analyze_publication_dates()
+            results.append((spikes, day_counts, daily_counts, eda.identify_spikes(threshold=1.0),
+                            eda.plot_day_of_week_frequency()))
+        expected, partitioned = results
+
+        for result, expected_result in zip(partitioned, expected):
+            pd.testing.assert_series_equal(result, expected_result)
+        pd.testing.assert_series_equal(expected[3], expected[0])
+        pd.testing.assert_series_equal(expected[4], expected[1])
+
+    def test_empty_dataset(self):
+        empty_dir = os.path.join(self.tmp_dir.name, 'empty')
+        os.mkdir(empty_dir)
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        pq.write_table(table.slice(0, 0), os.path.join(empty_dir, 'part-0.parquet'))
+        dataset = PartitionedDataset(empty_dir)
+        empty_df = self.df.iloc[0:0].copy()
+
+        for analysis in (EDA(dataset), TimeSeriesAnalysis(dataset)):
+            spikes = analysis.identify_spikes()
+            self.assertTrue(spikes.empty)
+            self.assertIsInstance(spikes.index, pd.DatetimeIndex)
+
+        expected = EDA(empty_df.copy()).get_textual_lengths_stats()
+        stats = EDA(dataset).get_textual_lengths_stats()
+        self.assertEqual(stats.keys(), expected.keys())
+        self.assertTrue(all(pd.isna(value) for value in expected.values()))
+        self.assertTrue(all(pd.isna(value) for value in stats.values()))
+
+        for analysis in (TextAnalysis(empty_df.copy()), TextAnalysis(dataset)):
+            summary = analysis.summarize_sentiment()
+            self.assertTrue(summary.empty)
+            self.assertEqual(list(summary.columns), ['count', 'polarity', 'subjectivity'])
+
+    def test_analyze_publisher_domains(self):
+        expected = PublisherAnalysis(self.df.copy()).analyze_publisher_domains()
+        domain_counts = PublisherAnalysis(self.dataset).analyze_publisher_domains()
+        pd.testing.assert_series_equal(domain_counts, expected)
+
+    def test_publisher_analysis_call_order(self):
+        # Same sequence of calls as scripts/analyze_news.py
+        results = []
+        for analysis in (PublisherAnalysis(self.df.copy()), PublisherAnalysis(self.dataset)):
+            results.append((analysis.most_active_publishers(), analysis.analyze_publisher_domains(),
+                            analysis.analyze_news_type(), analysis.analyze_top_publishers_news_types(3)))
+        (expected_publishers, expected_domains, expected_news_types, expected_shares), \
+            (publishers, domains, news_types, shares) = results
+
+        pd.testing.assert_series_equal(publishers, expected_publishers)
+        pd.testing.assert_series_equal(domains, expected_domains)
+        pd.testing.assert_frame_equal(news_types, expected_news_types)
+        self.assertEqual(len(news_types), 4)
+        self.assertEqual(shares, expected_shares)
+
+    def test_summarize_sentiment(self):
+        expected = TextAnalysis(self.df.copy()).summarize_sentiment()
+        pd.testing.assert_frame_equal(TextAnalysis(self.dataset).summarize_sentiment(), expected)
+
+        with self.assertRaises(NotImplementedError):
+            TextAnalysis(self.dataset).perform_sentiment_analysis()
+
+    def test_publishing_times(self):
+        expected = TimeSeriesAnalysis(self.df).analyze_publishing_times()
+        pd.testing.assert_series_equal(TimeSeriesAnalysis(self.dataset).analyze_publishing_times(), expected)
+
+    def test_day_of_week_frequency(self):
+        eda = EDA(self.df.copy())
+        expected_daily_counts = eda.analyze_publication_dates()
+        expected = eda.plot_day_of_week_frequency()
+
+        partitioned_eda = EDA(self.dataset)
+        pd.testing.assert_series_equal(partitioned_eda.analyze_publication_dates(), expected_daily_counts)
+        pd.testing.assert_series_equal(partitioned_eda.plot_day_of_week_frequency(), expected)
+
+    # Fixed list so the test does not need the NLTK stopwords corpus. The whole corpus loader
+    # is patched, as accessing an attribute of it would try to load the corpus.
+    @mock.patch('src.text_analysis.stopwords')
+    def test_extract_keywords(self, stopwords):
+        stopwords.words.return_value = ['the', 'and', 'of', 'it', 'was', 'this', 'that', 'a']
+
+        df = pd.DataFrame({'headline': [
+            'The and of it', 'Was this it',  # A partition made of stop words only
+            'Price target raised', 'Price target lowered', 'Stocks that hit 52-week highs',
+            'Stocks that hit 52-week lows', 'Analyst upgrades stock', 'Analyst downgrades stock',
+            'Earnings beat estimates', 'Earnings miss estimates', 'Price target maintained']})
+        path = os.path.join(self.tmp_dir.name, 'keywords.parquet')
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=2)
+        dataset = PartitionedDataset(path)
+
+        for ngram_range, max_features in (((2, 3), 100), ((1, 2), 5)):
+            expected = TextAnalysis(df.copy()).extract_keywords(ngram_range=ngram_range, max_features=max_features)
+            keywords = TextAnalysis(dataset).extract_keywords(ngram_range=ngram_range, max_features=max_features)
+            pd.testing.assert_series_equal(keywords.sort_index(), expected.sort_index())
+
+    def test_analyze_news_type(self):
+        expected_analysis = PublisherAnalysis(self.df.copy())
+        expected = expected_analysis.analyze_news_type()
+        analysis = PublisherAnalysis(self.dataset)
+        pd.testing.assert_frame_equal(analysis.analyze_news_type(), expected)
+
+        shares = analysis.analyze_top_publishers_news_types(top_n=3)
+        expected_shares = expected_analysis.analyze_top_publishers_news_types(top_n=3)
+        self.assertEqual(list(shares), list(expected_shares))
+        self.assertEqual(shares, expected_shares)
+
+    def test_process_pool(self):
+        dataset = PartitionedDataset(self.tmp_dir.name, max_workers=2, use_processes=True)
+
+        expected = EDA(self.df.copy()).count_articles_per_publisher()
+        pd.testing.assert_series_equal(EDA(dataset).count_articles_per_publisher(), expected)
+
+        expected = TextAnalysis(self.df.copy()).summarize_sentiment()
+        pd.testing.assert_frame_equal(TextAnalysis(dataset).summarize_sentiment(), expected)
+
+        expected = PublisherAnalysis(self.df.copy()).analyze_news_type()
+        pd.testing.assert_frame_equal(PublisherAnalysis(dataset).analyze_news_type(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()